@@ -1,14 +1,32 @@
 """OctoDNS provider implementation backed by the Metaname API."""
 
 import logging
+import random
 import time
-from typing import Any, Callable, Dict, Iterable, Optional, Tuple
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import replace
+from functools import lru_cache
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    Hashable,
+    Iterable,
+    List,
+    Optional,
+    Set,
+    Tuple,
+    Type,
+    cast,
+)
 
 from .client import (
     TEST_API_URL,
     MetanameAPIError,
     MetanameClient,
+    MetanameConnectionError,
     MetanameError,
+    MetanameTransportError,
     ZoneRecord,
     _strip_trailing_dot,
 )
@@ -16,15 +34,23 @@ from .client import (
 __all__ = [
     "MetanameAPIError",
     "MetanameClient",
+    "MetanameConnectionError",
     "MetanameError",
     "MetanameProvider",
+    "MetanameTransportError",
     "TEST_API_URL",
     "ZoneRecord",
 ]
 
+# OctoDNS change classes mapped to the action name of their handler.
+_CHANGE_ACTIONS: Dict[type, str] = {}
+
 try:  # pragma: no cover - exercised when octodns is installed
     from octodns.provider.base import BaseProvider  # type: ignore
     from octodns.record import Record as OctoDNSRecord  # type: ignore
+    from octodns.record.change import Create, Delete, Update  # type: ignore
+
+    _CHANGE_ACTIONS.update({Create: "create", Delete: "delete", Update: "update"})
 except ImportError:  # pragma: no cover - default in test environment
 
     class BaseProvider:  # type: ignore
@@ -44,20 +70,62 @@ except ImportError:  # pragma: no cover - default in test environment
 
 __version__ = "0.1.1"
 
+_RpcCall = Tuple[str, List[Any]]
+# An RPC call paired with the zone record it creates or deletes.
+_PendingCall = Tuple[str, List[Any], ZoneRecord]
+# ``(name, rtype, data, ttl, aux)`` as derived from an OctoDNS record value.
+_RecordFields = Tuple[str, str, str, int, Optional[int]]
+
+# JSON-RPC errors that will fail identically on every attempt: parse error,
+# invalid request, method not found and invalid params.
+_PERMANENT_ERROR_CODES = frozenset({-32700, -32600, -32601, -32602})
+# Metaname reports rejected credentials without a dedicated error code, so
+# authentication failures are recognised by message (matched lowercased).
+_PERMANENT_ERROR_MESSAGES = (
+    "domain name not found",
+    "authentication",
+    "api key",
+    "account reference",
+)
+# JSON-RPC "Invalid Request"; servers without batch support answer a batch
+# with this as a single error object.
+_INVALID_REQUEST = -32600
+
 
+@lru_cache(maxsize=1024)
 def _ensure_trailing_dot(value: str) -> str:
     if not value:
         return value
-    return value if value.endswith(".") else f"{value}."
+    return value if value.endswith(".") else value + "."
 
 
 def _normalize_value(value: Any) -> Any:
-    if isinstance(value, str):
-        stripped = value.strip()
-        return stripped
+    # ``str.strip`` hands back the same object when there is nothing to
+    # strip, so the common already-clean value costs no allocation.
+    if type(value) is str:
+        return value.strip()
     return value
 
 
+def _is_permanent_error(exc: MetanameError) -> bool:
+    """Return ``True`` when retrying ``exc`` cannot succeed."""
+
+    if not isinstance(exc, MetanameAPIError):
+        return False
+    if exc.code in _PERMANENT_ERROR_CODES:
+        return True
+    message = str(exc).lower()
+    return any(marker in message for marker in _PERMANENT_ERROR_MESSAGES)
+
+
+def _value_key(value: Any) -> Hashable:
+    """Return a hashable stand-in for ``value`` (MX values arrive as dicts)."""
+
+    if isinstance(value, dict):
+        return tuple(sorted(value.items()))
+    return cast(Hashable, value)
+
+
 def _escape_txt(value: str) -> str:
     return value.replace(";", r"\;")
 
@@ -82,17 +150,39 @@ class MetanameProvider(BaseProvider):
         base_url: Optional[str] = None,
         retries: int = 3,
         retry_backoff: float = 1.0,
+        batch: bool = True,
+        max_workers: int = 8,
+        cache_ttl: float = 0,
         sleep: Callable[[float], None] = time.sleep,
+        clock: Callable[[], float] = time.monotonic,
         record_factory: Optional[Callable[..., Any]] = None,
         **kwargs: Any,
     ) -> None:
         super().__init__(id, **kwargs)
-        self.client = client or MetanameClient(base_url=base_url or TEST_API_URL)
+        self.max_workers = max(1, max_workers)
+        # One pooled connection per worker thread, so ``batch: false`` never
+        # overflows the pool and opens throwaway connections.
+        self.client = client or MetanameClient(
+            base_url=base_url or TEST_API_URL, pool_maxsize=self.max_workers
+        )
         self.retries = max(1, retries)
         self.retry_backoff = max(0.0, retry_backoff)
+        self.batch = batch
+        self.cache_ttl = max(0.0, cache_ttl)
         self._sleep = sleep
+        self._clock = clock
+        self._listing_cache: Dict[str, Tuple[Tuple[ZoneRecord, ...], float]] = {}
         self._record_factory = record_factory or OctoDNSRecord.new
         self._zone_cache: Dict[str, Dict[Tuple[str, str, str, Optional[int]], ZoneRecord]] = {}
+        self._handlers_by_action: Dict[str, Callable[[str, Any], List[_PendingCall]]] = {
+            "create": self._change_create,
+            "delete": self._change_delete,
+            "update": self._change_update,
+        }
+        self._action_handlers = {
+            change_type: self._handlers_by_action[action]
+            for change_type, action in _CHANGE_ACTIONS.items()
+        }
 
     # -- OctoDNS hooks -------------------------------------------------
 
@@ -102,7 +192,7 @@ class MetanameProvider(BaseProvider):
             raise ValueError("Zone name is required for populate")
 
         try:
-            records = self._with_retries(self.client.list_zone_records, domain)
+            records: Iterable[ZoneRecord] = self._list_records(domain)
         except MetanameError as exc:
             if "Domain name not found" in str(exc):
                 self.log.info("Metaname returned missing domain for %s; treating as empty", domain)
@@ -113,6 +203,8 @@ class MetanameProvider(BaseProvider):
         added = False
 
         aggregated: Dict[Tuple[str, str, Optional[int]], Dict[str, Any]] = {}
+        seen: Dict[Tuple[str, str, Optional[int]], Set[Hashable]] = {}
+        suffix = f".{domain}"
 
         for record in records:
             cache[self._cache_key(record)] = record
@@ -145,61 +237,32 @@ class MetanameProvider(BaseProvider):
                     continue
                 data["values"] = cleaned
             owner = (record.name or "").rstrip(".")
-            if not owner or owner == "@":
-                owner = ""
-            elif owner == domain:
+            if owner == "@" or owner == domain:
                 owner = ""
-            elif owner.endswith(f".{domain}"):
-                owner = owner[: -(len(domain) + 1)]
+            else:
+                owner = owner.removesuffix(suffix)
             rtype = data.get("type", record.rtype)
             ttl = data.get("ttl")
             key = (owner, rtype, ttl)
 
-            existing = aggregated.get(key)
-            if existing:
-                if "values" in data:
-                    existing_values = existing.setdefault("values", [])
-                    for item in data.get("values", []):
-                        if item not in existing_values:
-                            existing_values.append(item)
-                if "value" in data:
-                    existing["value"] = data["value"]
-            else:
-                aggregated[key] = dict(data)
+            merged = aggregated.get(key)
+            if merged is None:
+                merged = aggregated[key] = {"type": rtype, "ttl": ttl}
+                seen[key] = set()
+            if "values" in data:
+                merged_values = merged.setdefault("values", [])
+                merged_seen = seen[key]
+                for item in data["values"]:
+                    marker = _value_key(item)
+                    if marker not in merged_seen:
+                        merged_seen.add(marker)
+                        merged_values.append(item)
+            if "value" in data:
+                merged["value"] = data["value"]
 
+        # Values were normalised per record above, so aggregated rrsets are
+        # ready to hand to OctoDNS as-is.
         for (owner, _rtype, _ttl), record_data in aggregated.items():
-            if "value" in record_data:
-                normalized = _normalize_value(record_data["value"])
-                if normalized in (None, ""):
-                    self.log.warning(
-                        "Skipping aggregated record %s (%s) with empty value",
-                        owner or "@",
-                        record_data.get("type"),
-                    )
-                    continue
-                record_data["value"] = normalized
-            if "values" in record_data:
-                cleaned = []
-                for item in record_data["values"]:
-                    normalized = _normalize_value(item)
-                    if normalized in (None, ""):
-                        continue
-                    cleaned.append(normalized)
-                if not cleaned:
-                    self.log.warning(
-                        "Skipping aggregated record %s (%s) with empty values list",
-                        owner or "@",
-                        record_data.get("type"),
-                    )
-                    continue
-                record_data["values"] = cleaned
-            if "value" not in record_data and "values" not in record_data:
-                self.log.warning(
-                    "Skipping aggregated record %s (%s) with no value payload",
-                    owner or "@",
-                    record_data.get("type"),
-                )
-                continue
             created = self._record_factory(zone, owner, record_data, source=self)
             zone.add_record(created, lenient=lenient)
             added = True
@@ -219,58 +282,176 @@ class MetanameProvider(BaseProvider):
             raise ValueError("Plan is missing zone metadata")
         domain = _strip_trailing_dot(zone_name)
 
+        pending: List[_PendingCall] = []
         for change in changes:
-            action = change.__class__.__name__.lower()
-            if action == "create":
-                self._apply_create(domain, change.new)
-            elif action == "delete":
-                self._apply_delete(domain, change.existing)
-            elif action == "update":
-                # Metaname exposes ``update_dns_record`` but the OctoDNS plan
-                # model already represents updates as delete+create pairs, so
-                # reuse that flow for now.
-                self._apply_delete(domain, change.existing)
-                self._apply_create(domain, change.new)
-            else:
-                raise ValueError(f"Unsupported change action: {action}")
-
-        self._zone_cache.pop(domain, None)
+            handler = self._action_handlers.get(type(change))
+            if handler is None:
+                # Unknown change types (e.g. shims in tests) fall back to the
+                # class name.
+                action = change.__class__.__name__.lower()
+                handler = self._handlers_by_action.get(action)
+                if handler is None:
+                    raise ValueError(f"Unsupported change action: {action}")
+            pending.extend(handler(domain, change))
+
+        pending = self._skip_redundant_creates(domain, pending)
+        if pending:
+            try:
+                self._dispatch(domain, pending)
+            finally:
+                self._listing_cache.pop(domain, None)
         return True
 
     # -- Internal helpers ----------------------------------------------
 
-    def _apply_create(self, domain: str, record: Any) -> None:
-        for zone_record in self._octodns_record_to_metaname(record):
-            self._with_retries(self.client.create_zone_record, domain, zone_record)
+    def _change_create(self, domain: str, change: Any) -> List[_PendingCall]:
+        return self._apply_create(domain, change.new)
 
-    def _apply_delete(self, domain: str, record: Any) -> None:
+    def _change_delete(self, domain: str, change: Any) -> List[_PendingCall]:
+        return self._apply_delete(domain, change.existing)
+
+    def _change_update(self, domain: str, change: Any) -> List[_PendingCall]:
+        # Metaname exposes ``update_dns_record`` but the OctoDNS plan model
+        # already represents updates as delete+create pairs, so reuse that
+        # flow for now.
+        pending = self._apply_delete(domain, change.existing)
+        pending.extend(self._apply_create(domain, change.new))
+        return pending
+
+    def _apply_create(self, domain: str, record: Any) -> List[_PendingCall]:
+        return [
+            ("create_dns_record", [domain, zone_record.to_api_payload()], zone_record)
+            for zone_record in self._octodns_record_to_metaname(record)
+        ]
+
+    def _apply_delete(self, domain: str, record: Any) -> List[_PendingCall]:
         cache = self._ensure_cache(domain)
-        for zone_record in self._octodns_record_to_metaname(record):
-            key = self._cache_key(zone_record)
-            cached = cache.get(key)
+        pending: List[_PendingCall] = []
+        # Deletes only need the cached reference, so look it up straight from
+        # the converted fields without building throwaway ZoneRecords.
+        for name, rtype, data, _ttl, aux in self._octodns_record_fields(record):
+            cached = cache.get((name, rtype, data, aux))
             if cached and cached.reference:
-                self._with_retries(self.client.delete_zone_record, domain, cached.reference)
+                pending.append(("delete_dns_record", [domain, cached.reference], cached))
+        return pending
+
+    def _skip_redundant_creates(
+        self, domain: str, pending: List[_PendingCall]
+    ) -> List[_PendingCall]:
+        """Drop creates for records that already exist or repeat within the plan."""
+
+        cache = self._ensure_cache(domain)
+        deleting = {
+            self._cache_key(zone_record)
+            for method, _, zone_record in pending
+            if method == "delete_dns_record"
+        }
+        creating: Set[Tuple[str, str, str, Optional[int]]] = set()
+        kept: List[_PendingCall] = []
+        for call in pending:
+            method, _, zone_record = call
+            if method == "create_dns_record":
+                key = self._cache_key(zone_record)
+                if key in creating or (key in cache and key not in deleting):
+                    continue
+                creating.add(key)
+            kept.append(call)
+        return kept
+
+    def _dispatch(self, domain: str, pending: List[_PendingCall]) -> None:
+        """Send ``pending`` deletes, then creates, and fold the results into the cache."""
+
+        cache = self._zone_cache.get(domain)
+        deletes = [call for call in pending if call[0] == "delete_dns_record"]
+        creates = [call for call in pending if call[0] != "delete_dns_record"]
+        for phase in (deletes, creates):
+            if not phase:
+                continue
+            try:
+                results = self._send_phase([(method, params) for method, params, _ in phase])
+                failed = next((r for r in results if isinstance(r, MetanameError)), None)
+                if failed is not None:
+                    raise failed
+            except MetanameError:
+                # A missing key means "no such record", so after a failure we
+                # cannot vouch for any of the domain's keys; drop the whole
+                # cache and let the next lookup refetch the zone.
+                self._zone_cache.pop(domain, None)
+                raise
+            if cache is None:
+                continue
+            for (method, _, zone_record), result in zip(phase, results):
+                key = self._cache_key(zone_record)
+                if method == "delete_dns_record":
+                    cache.pop(key, None)
+                    continue
+                reference = result.get("value") if isinstance(result, dict) else None
+                if not reference:
+                    # A later delete needs the reference, so refetch the zone
+                    # rather than cache a record that cannot be deleted.
+                    self._zone_cache.pop(domain, None)
+                    cache = None
+                    break
+                cache[key] = replace(zone_record, reference=reference)
+
+    def _send_phase(self, calls: List[_RpcCall]) -> List[Any]:
+        """Send one phase of ``calls``, as a JSON-RPC batch when enabled."""
+
+        if self.batch:
+            try:
+                return cast(
+                    List[Any],
+                    self._with_retries(
+                        self.client._rpc_batch, calls, retry_on=MetanameConnectionError
+                    ),
+                )
+            except MetanameAPIError as exc:
+                if exc.code != _INVALID_REQUEST:
+                    raise
+                self.log.warning(
+                    "Metaname rejected a batch request (%s); sending changes individually", exc
+                )
+                self.batch = False
+        return self._call_each(calls)
+
+    def _call_each(self, calls: List[_RpcCall]) -> List[Any]:
+        """Issue ``calls`` as individual requests, overlapped on a thread pool."""
+
+        if len(calls) <= 2 or self.max_workers == 1:
+            return [
+                self._with_retries(self.client._rpc, method, params) for method, params in calls
+            ]
+        with ThreadPoolExecutor(max_workers=min(self.max_workers, len(calls))) as executor:
+            futures = [
+                executor.submit(self._with_retries, self.client._rpc, method, params)
+                for method, params in calls
+            ]
+            return [future.result() for future in futures]
 
     def _metaname_to_octodns(self, record: ZoneRecord) -> Dict[str, Any]:
-        payload: Dict[str, Any] = {"type": record.rtype, "ttl": record.ttl}
-        if record.rtype == "MX":
-            payload["values"] = [
+        rtype = record.rtype
+        if rtype == "MX":
+            values: List[Any] = [
                 {
                     "exchange": _ensure_trailing_dot(record.data),
                     "preference": record.aux if record.aux is not None else 0,
                 }
             ]
-        elif record.rtype == "CAA":
-            payload["values"] = [record.data]
-        elif record.rtype == "TXT":
-            payload["values"] = [_escape_txt(record.data)]
-        elif record.rtype in ("CNAME", "NS"):
-            payload["value"] = _ensure_trailing_dot(record.data)
+        elif rtype == "TXT":
+            values = [_escape_txt(record.data)]
+        elif rtype in ("CNAME", "NS"):
+            return {"type": rtype, "ttl": record.ttl, "value": _ensure_trailing_dot(record.data)}
         else:
-            payload["values"] = [record.data]
-        return payload
+            values = [record.data]
+        return {"type": rtype, "ttl": record.ttl, "values": values}
 
     def _octodns_record_to_metaname(self, record: Any) -> Iterable[ZoneRecord]:
+        for name, rtype, data, ttl, aux in self._octodns_record_fields(record):
+            yield ZoneRecord(reference=None, name=name, rtype=rtype, data=data, ttl=ttl, aux=aux)
+
+    def _octodns_record_fields(self, record: Any) -> Iterable[_RecordFields]:
+        """Yield ``(name, rtype, data, ttl, aux)`` for each value of ``record``."""
+
         rtype = getattr(record, "rtype", getattr(record, "_type", None))
         if rtype is None:
             raise ValueError("Record missing type information")
@@ -286,23 +467,16 @@ class MetanameProvider(BaseProvider):
                 else:
                     exchange = getattr(value, "exchange", getattr(value, "value", str(value)))
                     preference = getattr(value, "preference", getattr(value, "priority", None))
-                yield ZoneRecord(
-                    reference=None,
-                    name=name,
-                    rtype="MX",
-                    data=_ensure_trailing_dot(str(exchange)),
-                    ttl=ttl,
-                    aux=int(preference) if preference is not None else None,
+                yield (
+                    name,
+                    "MX",
+                    _ensure_trailing_dot(str(exchange)),
+                    ttl,
+                    int(preference) if preference is not None else None,
                 )
         elif rtype == "TXT":
             for value in getattr(record, "values", []):
-                yield ZoneRecord(
-                    reference=None,
-                    name=name,
-                    rtype="TXT",
-                    data=_unescape_txt(str(value)),
-                    ttl=ttl,
-                )
+                yield (name, "TXT", _unescape_txt(str(value)), ttl, None)
         elif rtype == "CAA":
             for value in getattr(record, "values", []):
                 if isinstance(value, dict):
@@ -317,49 +491,67 @@ class MetanameProvider(BaseProvider):
                     data = " ".join(parts)
                 else:
                     data = str(value)
-                yield ZoneRecord(
-                    reference=None,
-                    name=name,
-                    rtype="CAA",
-                    data=data,
-                    ttl=ttl,
-                )
+                yield (name, "CAA", data, ttl, None)
         else:
             value = getattr(record, "value", None)
             if value is None:
                 values = getattr(record, "values", [])
                 value = values[0] if values else ""
-            value = _normalize_value(value)
-            data = _ensure_trailing_dot(str(value)) if rtype in {"CNAME", "NS"} else str(value)
-            yield ZoneRecord(
-                reference=None,
-                name=name,
-                rtype=rtype,
-                data=data,
-                ttl=ttl,
-            )
-
-    def _cache_key(self, record: ZoneRecord) -> Tuple[str, str, str, Optional[int]]:
+            # OctoDNS values are ``str`` subclasses; ``str()`` gives a plain
+            # string so the strip always applies.
+            data = str(value).strip()
+            if rtype in {"CNAME", "NS"}:
+                data = _ensure_trailing_dot(data)
+            yield (name, rtype, data, ttl, None)
+
+    @staticmethod
+    def _cache_key(record: ZoneRecord) -> Tuple[str, str, str, Optional[int]]:
         return (record.name, record.rtype, record.data, record.aux)
 
-    def _with_retries(self, func: Callable[..., Any], *args: Any, **kwargs: Any) -> Any:
+    def _with_retries(
+        self,
+        func: Callable[..., Any],
+        *args: Any,
+        retry_on: Type[MetanameError] = MetanameError,
+        **kwargs: Any,
+    ) -> Any:
         last_error: Optional[Exception] = None
         for attempt in range(1, self.retries + 1):
             try:
                 return func(*args, **kwargs)
             except MetanameError as exc:
                 last_error = exc
-                if attempt == self.retries:
+                if (
+                    attempt == self.retries
+                    or not isinstance(exc, retry_on)
+                    or _is_permanent_error(exc)
+                ):
                     raise
-                self._sleep(self.retry_backoff * attempt)
+                # Exponential backoff with jitter so concurrent runs do not
+                # retry against the API in lockstep.
+                delay = self.retry_backoff * (2 ** (attempt - 1))
+                self._sleep(delay * (0.5 + random.random()))
         if last_error is not None:
             raise last_error
         raise RuntimeError("Retry loop exited without executing function")
 
+    def _list_records(self, domain: str) -> Tuple[ZoneRecord, ...]:
+        """Fetch ``domain``'s records, reusing a listing younger than ``cache_ttl``."""
+
+        if self.cache_ttl:
+            cached = self._listing_cache.get(domain)
+            if cached is not None and self._clock() - cached[1] < self.cache_ttl:
+                return cached[0]
+        fetched_at = self._clock()
+        records = tuple(self._with_retries(self.client.list_zone_records, domain))
+        if self.cache_ttl:
+            self._listing_cache[domain] = (records, fetched_at)
+        return records
+
     def _ensure_cache(self, domain: str) -> Dict[Tuple[str, str, str, Optional[int]], ZoneRecord]:
         cache = self._zone_cache.get(domain)
         if cache is None:
-            records = self._with_retries(self.client.list_zone_records, domain)
+            records = self._list_records(domain)
             cache = {self._cache_key(record): record for record in records}
             self._zone_cache[domain] = cache
         return cache
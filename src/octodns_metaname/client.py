@@ -4,18 +4,39 @@ from __future__ import annotations
 
 import json
 import os
+import sys
 from dataclasses import dataclass
-from typing import Any, Dict, Iterator, Optional, Union, cast
-
-import requests
+from functools import lru_cache
+from types import TracebackType
+from typing import TYPE_CHECKING, Any, Dict, Iterator, Optional, Type, Union, cast
 
 from .secrets import MissingSecret, get_secret
 
+try:  # pragma: no cover - exercised when the 'fast' extra is installed
+    import orjson
+except ImportError:  # pragma: no cover - stdlib json fallback
+    orjson = None  # type: ignore[assignment]
+
+try:  # pragma: no cover - exercised when the 'stream' extra is installed
+    import ijson  # type: ignore[import-untyped]
+except ImportError:  # pragma: no cover - buffered fallback
+    ijson = None
+
+if TYPE_CHECKING:  # pragma: no cover
+    import requests
+
+# ijson prefixes of the records inside ``dns_zone``/``dns_zone_chunk`` results,
+# which arrive either as a bare list or wrapped as ``{"records": [...]}``.
+_STREAM_ITEM_PREFIXES = ("result.item", "result.records.item")
+
+# ``slots=True`` drops the per-instance ``__dict__``; it needs Python 3.10+.
+_SLOTS: Dict[str, Any] = {"slots": True} if sys.version_info >= (3, 10) else {}
+
 TEST_API_URL = "https://test.metaname.net/api/1.1"
 PROD_API_URL = "https://metaname.net/api/1.1"
 
 
-@dataclass
+@dataclass(frozen=True, **_SLOTS)
 class Contact:
     """Contact details used when provisioning domains via the API."""
 
@@ -56,7 +77,7 @@ class Contact:
         }
 
 
-@dataclass
+@dataclass(frozen=True, **_SLOTS)
 class ZoneRecord:
     """Representation of a DNS record as returned by the Metaname API."""
 
@@ -98,6 +119,14 @@ class MetanameError(RuntimeError):
     """Generic error for Metaname client failures."""
 
 
+class MetanameTransportError(MetanameError):
+    """Raised when no JSON-RPC response came back (network or HTTP failure)."""
+
+
+class MetanameConnectionError(MetanameTransportError):
+    """Raised when a request never reached Metaname (connection refused or timed out)."""
+
+
 class MetanameAPIError(MetanameError):
     """Raised when the remote API reports an error."""
 
@@ -112,7 +141,9 @@ class MetanameAPIError(MetanameError):
 class MetanameClient:
     """Convenience wrapper around Metaname's JSON-RPC 2.0 endpoints."""
 
-    def __init__(self, *, base_url: str = TEST_API_URL, timeout: float = 10.0) -> None:
+    def __init__(
+        self, *, base_url: str = TEST_API_URL, timeout: float = 10.0, pool_maxsize: int = 16
+    ) -> None:
         """
         Parameters
         ----------
@@ -120,32 +151,202 @@ class MetanameClient:
             Target API URL. Defaults to the Metaname test endpoint.
         timeout:
             Timeout (seconds) applied to HTTP requests.
+        pool_maxsize:
+            Connections kept alive for concurrent requests; size it to the
+            number of threads sharing the client.
         """
 
         self.base_url = base_url.rstrip("/")
         self.timeout = timeout
         self.account_ref = get_secret("METANAME_ACCOUNT_REF")
         self.api_key = get_secret("METANAME_API_TOKEN")
+        # ``requests`` (and urllib3 behind it) is imported here rather than at
+        # module level so importing the package for its helpers stays cheap.
+        import requests
+        from requests.adapters import HTTPAdapter
+
+        # A shared session keeps the TCP/TLS connection alive between calls;
+        # retries are handled by the provider, not urllib3.
+        self._session = requests.Session()
+        self._session.headers["Content-Type"] = "application/json"
+        self._session.mount(
+            "https://",
+            HTTPAdapter(pool_connections=4, pool_maxsize=max(1, pool_maxsize), max_retries=0),
+        )
 
-    def _rpc(self, method: str, params: list[Any], *, request_id: int = 1) -> Any:
-        """Call a JSON-RPC method and return the parsed ``result`` payload."""
+    def close(self) -> None:
+        """Release pooled HTTP connections held by the client."""
+
+        self._session.close()
+
+    def __enter__(self) -> "MetanameClient":
+        return self
 
-        payload = {
+    def __exit__(
+        self,
+        exc_type: Optional[Type[BaseException]],
+        exc: Optional[BaseException],
+        tb: Optional[TracebackType],
+    ) -> None:
+        self.close()
+
+    def _send(self, payload: Any, *, stream: bool = False) -> requests.Response:
+        """POST a JSON-RPC payload over the pooled session."""
+
+        import requests
+
+        try:
+            if orjson is not None:
+                body = orjson.dumps(payload)
+                return self._session.post(
+                    self.base_url, data=body, timeout=self.timeout, stream=stream
+                )
+            return self._session.post(
+                self.base_url, json=payload, timeout=self.timeout, stream=stream
+            )
+        except requests.RequestException as exc:
+            if _never_sent(exc):
+                raise MetanameConnectionError(f"Could not connect to Metaname: {exc}") from exc
+            raise MetanameTransportError(f"Request to Metaname failed: {exc}") from exc
+
+    def _post(self, payload: Any) -> Any:
+        """POST a JSON-RPC payload and decode the reply."""
+
+        return self._decode(self._send(payload))
+
+    def _envelope(self, method: str, params: list[Any], request_id: int) -> Dict[str, Any]:
+        """Build the JSON-RPC request object for ``method``."""
+
+        return {
             "jsonrpc": "2.0",
             "method": method,
             "params": [self.account_ref, self.api_key, *params],
             "id": request_id,
         }
-        try:
-            response = requests.post(self.base_url, json=payload, timeout=self.timeout)
-        except requests.RequestException as exc:  # pragma: no cover
-            raise MetanameError(f"Request to Metaname failed: {exc}") from exc
+
+    def _rpc(self, method: str, params: list[Any], *, request_id: int = 1) -> Any:
+        """Call a JSON-RPC method and return the parsed ``result`` payload."""
+
+        return self._unwrap(self._post(self._envelope(method, params, request_id)))
+
+    def _rpc_items(self, method: str, params: list[Any]) -> Iterator[Dict[str, Any]]:
+        """
+        Yield the items of a list-valued JSON-RPC ``result``.
+
+        With ``ijson`` installed the response body is parsed incrementally, so
+        large zones are never held in memory as a whole. Otherwise this falls
+        back to the buffered :meth:`_rpc` path.
+        """
+
+        if ijson is not None:
+            yield from self._rpc_stream(method, params)
+            return
+        result = self._rpc(method, params)
+        if isinstance(result, dict):
+            result = result.get("records", [])
+        yield from result or []
+
+    def _rpc_stream(self, method: str, params: list[Any]) -> Iterator[Dict[str, Any]]:
+        """Stream the ``result`` items of ``method`` using ``ijson``."""
+
+        import requests
+        from urllib3.exceptions import HTTPError
+
+        response = self._send(self._envelope(method, params, 1), stream=True)
+        with response:
+            if response.status_code != 200:
+                raise MetanameTransportError(
+                    f"Metaname returned HTTP {response.status_code}: {response.text}"
+                )
+            response.raw.decode_content = True
+            builder: Any = None
+            builder_prefix = ""
+            error: Any = None
+            has_result = False
+            try:
+                for prefix, event, value in ijson.parse(response.raw, use_float=True):
+                    if builder is not None:
+                        builder.event(event, value)
+                        if prefix == builder_prefix and event == "end_map":
+                            if builder_prefix == "error":
+                                error = builder.value
+                            else:
+                                yield builder.value
+                            builder = None
+                    elif event == "start_map" and (
+                        prefix in _STREAM_ITEM_PREFIXES or prefix == "error"
+                    ):
+                        builder = ijson.ObjectBuilder()
+                        builder_prefix = prefix
+                        builder.event(event, value)
+                    elif prefix == "result":
+                        has_result = True
+            except ijson.JSONError as exc:
+                raise MetanameError("Metaname response was not valid JSON") from exc
+            except (HTTPError, requests.RequestException, OSError) as exc:
+                # Resets and read timeouts surface from the raw stream
+                # unwrapped by ``requests``.
+                raise MetanameTransportError(f"Reading from Metaname failed: {exc}") from exc
+        if error:
+            self._unwrap({"error": error})
+        if not has_result:
+            raise MetanameError("Metaname API response missing 'result'")
+
+    def _rpc_batch(self, calls: list[tuple[str, list[Any]]]) -> list[Any]:
+        """
+        Send ``calls`` as a single JSON-RPC 2.0 batch request.
+
+        Results are returned in the same order as ``calls``. Entries the
+        server answered with an error, or did not answer at all, come back as
+        :class:`MetanameError` instances rather than being raised: the other
+        entries have already been applied by then, so callers need every
+        outcome. Only failures of the batch as a whole are raised.
+        """
+
+        if not calls:
+            return []
+        payload = [
+            self._envelope(method, params, index)
+            for index, (method, params) in enumerate(calls, start=1)
+        ]
+        data = self._post(payload)
+        if isinstance(data, dict):
+            # Servers reject malformed batches with a single error object.
+            self._unwrap(data)
+        if not isinstance(data, list):
+            raise MetanameError("Metaname batch response was not a JSON array")
+        by_id = {item.get("id"): item for item in data if isinstance(item, dict)}
+        results: list[Any] = []
+        for index in range(1, len(calls) + 1):
+            item = by_id.get(index)
+            if item is None:
+                results.append(MetanameError(f"Metaname batch response missing id {index}"))
+                continue
+            try:
+                results.append(self._unwrap(item))
+            except MetanameError as exc:
+                results.append(exc)
+        return results
+
+    @staticmethod
+    def _decode(response: Any) -> Any:
+        """Validate the HTTP status of ``response`` and decode its JSON body."""
+
         if response.status_code != 200:
-            raise MetanameError(f"Metaname returned HTTP {response.status_code}: {response.text}")
+            raise MetanameTransportError(
+                f"Metaname returned HTTP {response.status_code}: {response.text}"
+            )
         try:
-            data = response.json()
+            if orjson is not None:
+                return orjson.loads(response.content)
+            return response.json()
         except json.JSONDecodeError as exc:
             raise MetanameError("Metaname response was not valid JSON") from exc
+
+    @staticmethod
+    def _unwrap(data: Dict[str, Any]) -> Any:
+        """Return the ``result`` of a single JSON-RPC response object."""
+
         error = data.get("error")
         if error:
             raise MetanameAPIError(
@@ -193,20 +394,18 @@ class MetanameClient:
         if page_size:
             offset = 0
             while True:
-                records = self._rpc("dns_zone_chunk", [domain, page_size, offset])
-                if not records:
-                    break
-                for item in records:
+                count = 0
+                for item in self._rpc_items("dns_zone_chunk", [domain, page_size, offset]):
+                    count += 1
                     yield ZoneRecord.from_api(item)
-                offset += len(records)
-                if len(records) < page_size:
+                if not count:
+                    break
+                offset += count
+                if count < page_size:
                     break
             return
 
-        records = self._rpc("dns_zone", [domain])
-        if isinstance(records, dict):
-            records = records.get("records", [])
-        for item in records or []:
+        for item in self._rpc_items("dns_zone", [domain]):
             yield ZoneRecord.from_api(item)
 
     def create_zone_record(
@@ -269,6 +468,23 @@ class MetanameClient:
         )
 
 
+def _never_sent(exc: Exception) -> bool:
+    """Return ``True`` when ``exc`` shows the request never reached the server."""
+
+    import requests
+    from urllib3.exceptions import NewConnectionError
+
+    if isinstance(exc, requests.ConnectTimeout):
+        return True
+    if not isinstance(exc, requests.ConnectionError) or not exc.args:
+        return False
+    # Refused and unresolvable connections arrive as ``MaxRetryError`` whose
+    # reason is the failed connect; anything later (resets, read errors) may
+    # follow a delivered request.
+    return isinstance(getattr(exc.args[0], "reason", None), NewConnectionError)
+
+
+@lru_cache(maxsize=1024)
 def _strip_trailing_dot(domain: str) -> str:
     """Return ``domain`` without a trailing dot."""
 
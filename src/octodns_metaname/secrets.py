@@ -5,17 +5,19 @@ optionally register a resolver (e.g., 1Password, Vault) via
 ``set_secret_resolver`` or the ``OCTODNS_METANAME_SECRET_RESOLVER`` env var,
 which should contain ``module:function``. The resolver receives the secret name
 and the value of ``<NAME>_REF`` (if present) and should return the resolved
-secret or ``None`` when it cannot help.
+secret or ``None`` when it cannot help. Successful resolver lookups are cached
+per ``(name, reference)`` until the resolver is replaced or cleared.
 """
 
 import importlib
 import os
-from typing import Callable, Optional, cast
+from typing import Callable, Dict, Optional, Tuple, cast
 
 Resolver = Callable[[str, Optional[str]], Optional[str]]
 
 _secret_resolver: Optional[Resolver] = None
 _resolver_loaded = False
+_secret_cache: Dict[Tuple[str, Optional[str]], str] = {}
 
 
 class MissingSecret(RuntimeError):
@@ -28,6 +30,7 @@ def set_secret_resolver(resolver: Optional[Resolver]) -> None:
     global _secret_resolver, _resolver_loaded
     _secret_resolver = resolver
     _resolver_loaded = True
+    _secret_cache.clear()
 
 
 def _ensure_resolver_loaded() -> None:
@@ -61,11 +64,16 @@ def get_secret(name: str) -> str:
     ref_env = f"{name}_REF"
     reference = os.getenv(ref_env)
 
+    cached = _secret_cache.get((name, reference))
+    if cached is not None:
+        return cached
+
     _ensure_resolver_loaded()
 
     if _secret_resolver:
         resolved = _secret_resolver(name, reference)
         if resolved:
+            _secret_cache[(name, reference)] = resolved
             return resolved
 
     if reference:
@@ -82,3 +90,4 @@ def clear_secret_resolver() -> None:
     global _secret_resolver, _resolver_loaded
     _secret_resolver = None
     _resolver_loaded = False
+    _secret_cache.clear()
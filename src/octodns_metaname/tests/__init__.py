@@ -4,7 +4,8 @@ Package exposing the pytest suites for documentation purposes.
 The concrete test modules live outside the installable package (under
 ``modules/octodns_metaname/tests``). To make their docstrings available to
 MkDocStrings, we load them dynamically and register them under the
-``octodns_metaname.tests`` namespace.
+``octodns_metaname.tests`` namespace. Loading happens lazily on first
+attribute access, so importing this package does not execute the suites.
 """
 
 import sys
@@ -18,20 +19,26 @@ _BASE = Path(__file__).resolve().parent.parent.parent.parent / "tests"
 
 
 def _load(module_name: str) -> ModuleType:
-    spec = spec_from_file_location(
-        f"octodns_metaname.tests.{module_name}", _BASE / f"{module_name}.py"
-    )
+    qualified_name = f"octodns_metaname.tests.{module_name}"
+    loaded = sys.modules.get(qualified_name)
+    if loaded is not None:
+        return loaded
+    spec = spec_from_file_location(qualified_name, _BASE / f"{module_name}.py")
     if spec is None or spec.loader is None:
         raise ImportError(f"Unable to load test module: {module_name}")
     module = module_from_spec(spec)
     loader = cast(Loader, spec.loader)
     loader.exec_module(module)
-    sys.modules[f"octodns_metaname.tests.{module_name}"] = module
+    sys.modules[qualified_name] = module
     return module
 
 
-test_client = _load("test_client")
-test_provider = _load("test_provider")
-test_secrets = _load("test_secrets")
+def __getattr__(name: str) -> ModuleType:
+    if name not in __all__:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    module = _load(name)
+    globals()[name] = module
+    return module
+
 
 __all__ = ["test_client", "test_provider", "test_secrets"]
@@ -0,0 +1,21 @@
+"""Shared pytest fixtures for the octodns-metaname test suite."""
+
+import pytest
+
+from octodns_metaname import MetanameProvider
+
+
+def fake_record_factory(zone, name, data, source):
+    return {"zone": zone.name, "name": name, "data": data, "source": source.id}
+
+
+@pytest.fixture
+def provider_factory():
+    """Build providers around a fake client with test-friendly defaults."""
+
+    def _make(client, **overrides):
+        overrides.setdefault("record_factory", fake_record_factory)
+        overrides.setdefault("sleep", lambda _: None)
+        return MetanameProvider("metaname", client=client, **overrides)
+
+    return _make
@@ -1,17 +1,29 @@
 """Unit tests for the Metaname JSON-RPC client helpers."""
 
+import dataclasses
+import functools
+import io
 import json
 from typing import Any
 
 import pytest
+import requests
+from urllib3.exceptions import MaxRetryError, NewConnectionError, ProtocolError
 
+from octodns_metaname import client as client_module
 from octodns_metaname.client import (
     MetanameAPIError,
     MetanameClient,
+    MetanameConnectionError,
     MetanameError,
+    MetanameTransportError,
     ZoneRecord,
 )
 
+# Gate on the client's own bindings: an importable package says nothing about
+# which code path the client actually takes.
+requires_ijson = pytest.mark.skipif(client_module.ijson is None, reason="ijson not installed")
+
 
 class DummyResponse:
     """Minimal stand-in for ``requests.Response`` used in client tests."""
@@ -19,10 +31,16 @@ class DummyResponse:
     def __init__(self, *, status: int = 200, payload: Any = None) -> None:
         self.status_code = status
         self._payload = payload or {"jsonrpc": "2.0", "result": {"ok": True}, "id": 1}
+
+    @functools.cached_property
+    def text(self) -> str:
         if isinstance(self._payload, Exception):
-            self.text = "error"
-        else:
-            self.text = json.dumps(self._payload)
+            return "error"
+        return json.dumps(self._payload)
+
+    @functools.cached_property
+    def content(self) -> bytes:
+        return self.text.encode()
 
     def json(self) -> Any:
         if isinstance(self._payload, Exception):
@@ -30,83 +48,115 @@ class DummyResponse:
         return self._payload
 
 
-@pytest.fixture
-def secrets(monkeypatch):
-    """Ensure required secrets env vars resolve during tests."""
-
-    monkeypatch.setenv("METANAME_ACCOUNT_REF", "acc-1")
-    monkeypatch.setenv("METANAME_API_TOKEN", "token-1")
-    monkeypatch.setattr(
-        "octodns_metaname.client.get_secret",
-        lambda name: {"METANAME_ACCOUNT_REF": "acc-1", "METANAME_API_TOKEN": "token-1"}[name],
-    )
-
-
-def make_client(secrets) -> MetanameClient:  # type: ignore[valid-type]
-    return MetanameClient(base_url="https://example.invalid/api")
-
+class StreamResponse:
+    """Streaming ``requests.Response`` stand-in exposing a raw byte stream."""
 
-def test_rpc_success(monkeypatch, secrets):
-    """A successful RPC returns the parsed ``result`` payload."""
+    def __init__(self, payload: Any, *, status: int = 200) -> None:
+        self.status_code = status
+        self.text = json.dumps(payload)
+        self.raw = io.BytesIO(self.text.encode())
 
-    response = DummyResponse(payload={"jsonrpc": "2.0", "result": {"balance": 123}, "id": 1})
-    monkeypatch.setattr("octodns_metaname.client.requests.post", lambda *_, **__: response)
+    def __enter__(self) -> "StreamResponse":
+        return self
 
-    client = make_client(secrets)
-    result = client._rpc("account_balance", [])
+    def __exit__(self, *_: Any) -> None:
+        self.raw.close()
 
-    assert result == {"balance": 123}
 
+@pytest.fixture(autouse=True)
+def patch_post(monkeypatch):
+    """Route every ``Session.post`` to ``patch_post["resp"]`` and record the calls."""
 
-def test_rpc_http_error(monkeypatch, secrets):
-    """Non-200 responses raise ``MetanameError``."""
+    holder: dict = {"resp": None, "calls": []}
 
-    response = DummyResponse(status=500, payload={"error": "oops"})
-    monkeypatch.setattr("octodns_metaname.client.requests.post", lambda *_, **__: response)
+    def fake_post(session, *_, **kwargs):
+        holder["calls"].append((session, kwargs))
+        return holder["resp"]
 
-    client = make_client(secrets)
-    with pytest.raises(MetanameError):
-        client._rpc("account_balance", [])
+    monkeypatch.setattr(requests.Session, "post", fake_post)
+    return holder
 
 
-def test_rpc_api_error(monkeypatch, secrets):
-    """API error payloads surface as ``MetanameAPIError`` with code info."""
+_SECRETS = {"METANAME_ACCOUNT_REF": "acc-1", "METANAME_API_TOKEN": "token-1"}
+_resolver = _SECRETS.__getitem__
 
-    response = DummyResponse(
-        payload={
-            "jsonrpc": "2.0",
-            "error": {"code": 123, "message": "Domain not found"},
-            "id": 1,
-        }
-    )
-    monkeypatch.setattr("octodns_metaname.client.requests.post", lambda *_, **__: response)
 
-    client = make_client(secrets)
-    with pytest.raises(MetanameAPIError) as excinfo:
-        client._rpc("dns_zone", ["example.com"])
+@pytest.fixture(scope="module")
+def secrets():
+    """Ensure required secrets env vars resolve during tests."""
 
-    assert excinfo.value.code == 123
+    with pytest.MonkeyPatch.context() as mp:
+        for name, value in _SECRETS.items():
+            mp.setenv(name, value)
+        mp.setattr("octodns_metaname.client.get_secret", _resolver)
+        yield
 
 
-def test_rpc_invalid_json(monkeypatch, secrets):
-    """Garbage JSON is treated as a generic client error."""
+def make_client(secrets) -> MetanameClient:  # type: ignore[valid-type]
+    return MetanameClient(base_url="https://example.invalid/api")
 
-    payload = json.JSONDecodeError("bad", "{}", 0)
-    response = DummyResponse(payload=payload)
-    monkeypatch.setattr("octodns_metaname.client.requests.post", lambda *_, **__: response)
 
+@pytest.mark.parametrize(
+    "response,expected,code",
+    [
+        pytest.param(
+            DummyResponse(payload={"jsonrpc": "2.0", "result": {"balance": 123}, "id": 1}),
+            {"balance": 123},
+            None,
+            id="success",
+        ),
+        pytest.param(
+            DummyResponse(status=500, payload={"error": "oops"}),
+            MetanameError,
+            None,
+            id="http-error",
+        ),
+        pytest.param(
+            DummyResponse(
+                payload={
+                    "jsonrpc": "2.0",
+                    "error": {"code": 123, "message": "Domain not found"},
+                    "id": 1,
+                }
+            ),
+            MetanameAPIError,
+            123,
+            id="api-error",
+        ),
+        pytest.param(
+            DummyResponse(payload=json.JSONDecodeError("bad", "{}", 0)),
+            MetanameError,
+            None,
+            id="invalid-json",
+        ),
+    ],
+)
+@pytest.mark.parametrize("fast", [True, False], ids=["orjson", "stdlib-json"])
+def test_rpc(response, expected, code, fast, monkeypatch, patch_post, secrets):
+    """RPC results are unwrapped; HTTP, API and JSON failures raise client errors."""
+
+    if fast and client_module.orjson is None:
+        pytest.skip("orjson not installed")
+    if not fast:
+        monkeypatch.setattr(client_module, "orjson", None)
+    patch_post["resp"] = response
     client = make_client(secrets)
-    with pytest.raises(MetanameError):
-        client._rpc("dns_zone", ["example.com"])
+
+    if isinstance(expected, type):
+        with pytest.raises(expected) as excinfo:
+            client._rpc("dns_zone", ["example.com"])
+        assert getattr(excinfo.value, "code", None) == code
+    else:
+        assert client._rpc("dns_zone", ["example.com"]) == expected
 
 
-def test_iter_zone_records_pagination(monkeypatch, secrets):
+def test_iter_zone_records_pagination(secrets):
     """Chunked iteration yields records and advances offsets as expected."""
 
     client = make_client(secrets)
     calls = []
 
-    def fake_rpc(method, params, *, request_id=1):
+    def fake_items(method, params):
         calls.append((method, tuple(params)))
         if method == "dns_zone_chunk":
             domain, page_size, offset = params
@@ -117,7 +167,7 @@ def test_iter_zone_records_pagination(monkeypatch, secrets):
             return []
         raise AssertionError("Unexpected method")
 
-    monkeypatch.setattr(client, "_rpc", fake_rpc)
+    client._rpc_items = fake_items  # throwaway instance, nothing to undo
 
     records = list(client.iter_zone_records("example.com.", page_size=100))
 
@@ -125,3 +175,252 @@ def test_iter_zone_records_pagination(monkeypatch, secrets):
     assert len(records) == 1
     assert isinstance(records[0], ZoneRecord)
     assert records[0].data == "1.2.3.4"
+
+
+def test_zone_record_is_frozen_and_hashable():
+    """Zone records are immutable value objects that can be shared and hashed."""
+
+    record = ZoneRecord.from_api({"reference": "rec-1", "type": "a", "data": "1.2.3.4"})
+
+    with pytest.raises(dataclasses.FrozenInstanceError):
+        record.data = "5.6.7.8"  # type: ignore[misc]
+    assert record == ZoneRecord("rec-1", "@", "A", "1.2.3.4", 3600)
+    assert len({record, ZoneRecord("rec-1", "@", "A", "1.2.3.4", 3600)}) == 1
+    assert record.to_api_payload() == {"name": "@", "type": "A", "data": "1.2.3.4", "ttl": 3600}
+
+
+def test_rpc_batch_orders_results_by_id(patch_post, secrets):
+    """Batched calls post once and map results back onto call order."""
+
+    patch_post["resp"] = DummyResponse(
+        payload=[
+            {"jsonrpc": "2.0", "result": "rec-2", "id": 2},
+            {"jsonrpc": "2.0", "result": None, "id": 1},
+        ]
+    )
+
+    client = make_client(secrets)
+    results = client._rpc_batch(
+        [
+            ("delete_dns_record", ["example.com", "rec-1"]),
+            ("create_dns_record", ["example.com", {"name": "www", "type": "A"}]),
+        ]
+    )
+
+    posted = [
+        json.loads(kwargs["data"]) if "data" in kwargs else kwargs["json"]
+        for _, kwargs in patch_post["calls"]
+    ]
+    assert len(posted) == 1
+    assert [call["id"] for call in posted[0]] == [1, 2]
+    assert posted[0][0]["params"] == ["acc-1", "token-1", "example.com", "rec-1"]
+    assert results == [{}, {"value": "rec-2"}]
+
+
+def test_rpc_batch_returns_entry_errors(patch_post, secrets):
+    """Per-entry errors and unanswered ids come back in place instead of raising."""
+
+    patch_post["resp"] = DummyResponse(
+        payload=[
+            {"jsonrpc": "2.0", "result": "rec-1", "id": 1},
+            {"jsonrpc": "2.0", "error": {"code": 7, "message": "Bad record"}, "id": 2},
+        ]
+    )
+
+    client = make_client(secrets)
+    results = client._rpc_batch(
+        [
+            ("create_dns_record", ["a", {}]),
+            ("create_dns_record", ["b", {}]),
+            ("create_dns_record", ["c", {}]),
+        ]
+    )
+
+    assert results[0] == {"value": "rec-1"}
+    assert isinstance(results[1], MetanameAPIError)
+    assert results[1].code == 7
+    assert isinstance(results[2], MetanameError)
+    assert "missing id 3" in str(results[2])
+
+
+@pytest.mark.parametrize(
+    "response,expected",
+    [
+        pytest.param(
+            DummyResponse(
+                payload={
+                    "jsonrpc": "2.0",
+                    "error": {"code": -32600, "message": "Invalid Request"},
+                    "id": None,
+                }
+            ),
+            MetanameAPIError,
+            id="rejected",
+        ),
+        pytest.param(DummyResponse(status=502, payload={}), MetanameTransportError, id="http"),
+    ],
+)
+def test_rpc_batch_raises_whole_batch_failures(response, expected, patch_post, secrets):
+    """Failures that cover the whole batch are raised rather than returned."""
+
+    patch_post["resp"] = response
+
+    client = make_client(secrets)
+    with pytest.raises(expected):
+        client._rpc_batch([("create_dns_record", ["a", {}])])
+
+
+def test_client_reuses_session_and_closes(monkeypatch, patch_post, secrets):
+    """All RPCs share one pooled session which ``close`` releases."""
+
+    closed = []
+    patch_post["resp"] = DummyResponse()
+    monkeypatch.setattr(requests.Session, "close", lambda session: closed.append(session))
+
+    with make_client(secrets) as client:
+        client._rpc("account_balance", [])
+        client._rpc("account_balance", [])
+
+    assert [session for session, _ in patch_post["calls"]] == [client._session] * 2
+    assert closed == [client._session]
+
+
+@pytest.mark.parametrize(
+    "result",
+    [
+        [{"reference": "rec-1", "name": "www", "type": "A", "data": "1.2.3.4", "ttl": 60}],
+        {
+            "records": [
+                {"reference": "rec-1", "name": "www", "type": "A", "data": "1.2.3.4", "ttl": 60}
+            ]
+        },
+    ],
+)
+@requires_ijson
+def test_iter_zone_records_streams_result(patch_post, secrets, result):
+    """With ijson available, zone records are parsed straight off the stream."""
+
+    patch_post["resp"] = StreamResponse({"jsonrpc": "2.0", "result": result, "id": 1})
+
+    client = make_client(secrets)
+    records = list(client.iter_zone_records("example.com."))
+
+    assert [kwargs["stream"] for _, kwargs in patch_post["calls"]] == [True]
+    assert [(r.reference, r.name, r.data) for r in records] == [("rec-1", "www", "1.2.3.4")]
+
+
+@requires_ijson
+def test_iter_zone_records_stream_error(patch_post, secrets):
+    """Streamed error payloads still surface as ``MetanameAPIError``."""
+
+    response = StreamResponse(
+        {"jsonrpc": "2.0", "error": {"code": 9, "message": "Domain name not found"}, "id": 1}
+    )
+    patch_post["resp"] = response
+
+    client = make_client(secrets)
+    with pytest.raises(MetanameAPIError) as excinfo:
+        list(client.iter_zone_records("example.com."))
+
+    assert excinfo.value.code == 9
+
+
+@pytest.mark.parametrize("page_size", [None, 100], ids=["dns_zone", "dns_zone_chunk"])
+@pytest.mark.parametrize(
+    "result",
+    [
+        [{"reference": "rec-1", "name": "www", "type": "A", "data": "1.2.3.4", "ttl": 60}],
+        {
+            "records": [
+                {"reference": "rec-1", "name": "www", "type": "A", "data": "1.2.3.4", "ttl": 60}
+            ]
+        },
+    ],
+    ids=["list", "records-dict"],
+)
+def test_iter_zone_records_buffered_without_ijson(
+    monkeypatch, patch_post, secrets, result, page_size
+):
+    """Without ijson, zone listings are read through the buffered ``_rpc`` path."""
+
+    monkeypatch.setattr(client_module, "ijson", None)
+    monkeypatch.setattr(client_module, "orjson", None)
+    patch_post["resp"] = DummyResponse(payload={"jsonrpc": "2.0", "result": result, "id": 1})
+
+    client = make_client(secrets)
+    records = list(client.iter_zone_records("example.com.", page_size=page_size))
+
+    assert [kwargs["stream"] for _, kwargs in patch_post["calls"]] == [False]
+    assert "json" in patch_post["calls"][0][1]
+    assert [(r.reference, r.name, r.data) for r in records] == [("rec-1", "www", "1.2.3.4")]
+
+
+def test_client_pool_maxsize_is_configurable(secrets):
+    """The pooled adapter keeps as many connections as there are workers."""
+
+    client = MetanameClient(base_url="https://example.invalid/api", pool_maxsize=32)
+
+    assert client._session.get_adapter("https://example.invalid")._pool_maxsize == 32
+
+
+@pytest.mark.parametrize(
+    "error,expected",
+    [
+        pytest.param(
+            requests.ConnectionError(MaxRetryError(None, "/", NewConnectionError(None, "refused"))),
+            MetanameConnectionError,
+            id="refused",
+        ),
+        pytest.param(requests.ConnectTimeout("connect"), MetanameConnectionError, id="connect"),
+        pytest.param(requests.ReadTimeout("read"), MetanameTransportError, id="read"),
+        pytest.param(
+            requests.ConnectionError(ProtocolError("Connection aborted.")),
+            MetanameTransportError,
+            id="aborted",
+        ),
+    ],
+)
+def test_send_classifies_request_failures(monkeypatch, secrets, error, expected):
+    """Only failures that precede delivery are reported as connection errors."""
+
+    def fail(*_, **__):
+        raise error
+
+    monkeypatch.setattr(requests.Session, "post", fail)
+
+    client = make_client(secrets)
+    with pytest.raises(MetanameTransportError) as excinfo:
+        client._rpc("account_balance", [])
+
+    assert type(excinfo.value) is expected
+
+
+class _FailingRaw:
+    """Raw stream that drops the connection after its first chunk."""
+
+    def __init__(self, chunk: bytes) -> None:
+        self._chunk = chunk
+
+    def read(self, size: int = -1) -> bytes:
+        if not size:
+            return b""
+        if self._chunk is None:
+            raise ProtocolError("Connection broken: IncompleteRead")
+        chunk, self._chunk = self._chunk, None
+        return chunk
+
+    def close(self) -> None:
+        pass
+
+
+@requires_ijson
+def test_iter_zone_records_stream_read_failure(patch_post, secrets):
+    """A connection lost mid-body surfaces as a retryable transport error."""
+
+    response = StreamResponse({"jsonrpc": "2.0", "result": [], "id": 1})
+    response.raw = _FailingRaw(b'{"jsonrpc": "2.0", "result": [')
+    patch_post["resp"] = response
+
+    client = make_client(secrets)
+    with pytest.raises(MetanameTransportError, match="Connection broken"):
+        list(client.iter_zone_records("example.com."))
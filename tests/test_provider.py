@@ -1,11 +1,41 @@
 """Behavioural tests for the OctoDNS Metaname provider wrapper."""
 
+import logging
+import threading
 from dataclasses import dataclass
 
 import pytest
 
+import octodns_metaname
 from octodns_metaname import MetanameProvider
-from octodns_metaname.client import MetanameError, ZoneRecord
+from octodns_metaname.client import (
+    MetanameAPIError,
+    MetanameConnectionError,
+    MetanameError,
+    MetanameTransportError,
+    ZoneRecord,
+)
+
+MX1 = ZoneRecord(
+    reference="rec-1", name="@", rtype="MX", data="mx1.forwardemail.net.", ttl=3600, aux=10
+)
+MX2 = ZoneRecord(
+    reference="rec-2", name="@", rtype="MX", data="mx2.forwardemail.net.", ttl=3600, aux=20
+)
+WWW_A = ZoneRecord(reference="rec-1", name="www", rtype="A", data="1.1.1.1", ttl=300)
+BLANK_A = ZoneRecord(reference="rec-empty", name="@", rtype="A", data="", ttl=3600)
+TXT_A = ZoneRecord(reference="rec-1", name="@", rtype="TXT", data="a", ttl=3600)
+TXT_OLD = ZoneRecord(reference="rec-1", name="@", rtype="TXT", data="old", ttl=3600)
+TXT_HELLO = ZoneRecord(reference="rec-1", name="@", rtype="TXT", data="hello", ttl=3600)
+DMARC = ZoneRecord(reference="rec-2", name="_dmarc", rtype="TXT", data="v=DMARC1", ttl=3600)
+
+MX1_KEY = MetanameProvider._cache_key(MX1)
+TXT_A_KEY = MetanameProvider._cache_key(TXT_A)
+TXT_HELLO_KEY = MetanameProvider._cache_key(TXT_HELLO)
+
+_EXPECTED_LIST = (("list", "opstest.nz"),)
+_EXPECTED_DELETE = (("delete", "opstest.nz", "rec-1"),)
+_EXPECTED_LIST_DELETE = (("list", "opstest.nz"), ("delete", "opstest.nz", "rec-2"))
 
 
 class DummyZone:
@@ -19,29 +49,33 @@ class DummyZone:
         self.records.append((record, lenient))
 
 
-def fake_record_factory(zone, name, data, source):
-    return {"zone": zone.name, "name": name, "data": data, "source": source.id}
-
-
 class FakeClient:
     """Fake Metaname client that records actions for assertions."""
 
     def __init__(self, records=None):
-        self.records = records or []
+        self.records = tuple(records or ())
         self.actions = []
+        self.lock = threading.Lock()
 
     def list_zone_records(self, domain):
         self.actions.append(("list", domain))
-        return list(self.records)
+        return self.records
 
-    def create_zone_record(self, domain, record):
-        self.actions.append(("create", domain, record))
+    def _rpc(self, method, params):
+        with self.lock:
+            if method == "create_dns_record":
+                self.actions.append(("create", *params))
+                return {"value": f"new-{len(self.actions)}"}
+            if method == "delete_dns_record":
+                self.actions.append(("delete", *params))
+                return {}
+        raise AssertionError(f"Unexpected method {method}")
 
-    def delete_zone_record(self, domain, reference):
-        self.actions.append(("delete", domain, reference))
+    def _rpc_batch(self, calls):
+        return [self._rpc(method, params) for method, params in calls]
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class FakeRecord:
     """Minimal record object mirroring the attributes OctoDNS uses."""
 
@@ -86,84 +120,93 @@ class DummyPlan:
         self.desired = type("Zone", (), {"name": zone_name})()
 
 
-def test_populate_builds_zone_cache():
-    zone_record = ZoneRecord(
-        reference="rec-1",
-        name="@",
-        rtype="MX",
-        data="mx1.forwardemail.net.",
-        ttl=3600,
-        aux=10,
-    )
-    client = FakeClient(records=[zone_record])
-    provider = MetanameProvider(
-        "metaname",
-        client=client,
-        record_factory=fake_record_factory,
-        sleep=lambda _: None,
-    )
+MX_RECORD = FakeRecord(
+    name="@",
+    rtype="MX",
+    ttl=3600,
+    values=[{"exchange": "mx1.forwardemail.net.", "preference": 10}],
+)
+MX_PLAN = DummyPlan([Create(MX_RECORD)], "opstest.nz.")
+HELLO_DELETE_PLAN = DummyPlan(
+    [Delete(FakeRecord(name="@", rtype="TXT", ttl=3600, values=["hello"]))], "opstest.nz."
+)
+DMARC_DELETE_PLAN = DummyPlan(
+    [Delete(FakeRecord(name="_dmarc", rtype="TXT", ttl=3600, values=["v=DMARC1"]))],
+    "opstest.nz.",
+)
+
+
+def test_populate_builds_zone_cache(provider_factory):
+    client = FakeClient(records=[MX1])
+    provider = provider_factory(client)
 
     zone = DummyZone("opstest.nz.")
     added = provider.populate(zone)
 
     assert added is True
-    assert client.actions == [("list", "opstest.nz")]
+    assert tuple(client.actions) == _EXPECTED_LIST
     assert len(zone.records) == 1
     assert zone.records[0][0]["name"] == ""
     assert zone.records[0][0]["data"]["values"][0]["exchange"] == "mx1.forwardemail.net."
     cache = provider._zone_cache["opstest.nz"]
-    assert provider._cache_key(zone_record) in cache
+    assert MX1_KEY in cache
 
 
-def test_populate_merges_duplicate_rrsets():
-    zone_records = [
-        ZoneRecord(
-            reference="rec-1",
-            name="@",
-            rtype="MX",
-            data="mx1.forwardemail.net.",
-            ttl=3600,
-            aux=10,
-        ),
-        ZoneRecord(
-            reference="rec-2",
-            name="@",
-            rtype="MX",
-            data="mx2.forwardemail.net.",
-            ttl=3600,
-            aux=20,
-        ),
-    ]
-    client = FakeClient(records=zone_records)
-    provider = MetanameProvider(
-        "metaname",
-        client=client,
-        record_factory=fake_record_factory,
-        sleep=lambda _: None,
-    )
+def test_populate_merges_duplicate_rrsets(provider_factory):
+    client = FakeClient(records=[MX1, MX2])
+    provider = provider_factory(client)
 
     zone = DummyZone("opstest.nz.")
     added = provider.populate(zone)
 
     assert added is True
-    assert client.actions == [("list", "opstest.nz")]
+    assert tuple(client.actions) == _EXPECTED_LIST
     record_payload = zone.records[0][0]["data"]
     exchanges = {v["exchange"] for v in record_payload["values"]}
     assert exchanges == {"mx1.forwardemail.net.", "mx2.forwardemail.net."}
 
 
-def test_populate_handles_missing_domain(monkeypatch):
+def test_populate_dedupes_repeated_values(provider_factory):
+    zone_records = [
+        ZoneRecord(reference=f"rec-{i}", name="www", rtype="A", data=data, ttl=300)
+        for i, data in enumerate(["1.1.1.1", " 1.1.1.1 ", "2.2.2.2"])
+    ]
+    client = FakeClient(records=zone_records)
+    provider = provider_factory(client)
+
+    zone = DummyZone("opstest.nz.")
+    provider.populate(zone)
+
+    assert len(zone.records) == 1
+    assert zone.records[0][0]["data"] == {
+        "type": "A",
+        "ttl": 300,
+        "values": ["1.1.1.1", "2.2.2.2"],
+    }
+
+
+def test_populate_strips_zone_origin_from_owner(provider_factory):
+    zone_records = [
+        ZoneRecord(reference="rec-1", name="opstest.nz.", rtype="A", data="1.1.1.1", ttl=300),
+        ZoneRecord(reference="rec-2", name="www.opstest.nz", rtype="A", data="2.2.2.2", ttl=300),
+        ZoneRecord(reference="rec-3", name="mail", rtype="A", data="3.3.3.3", ttl=300),
+    ]
+    client = FakeClient(records=zone_records)
+    provider = provider_factory(client)
+
+    zone = DummyZone("opstest.nz.")
+    provider.populate(zone)
+
+    assert [record["name"] for record, _ in zone.records] == ["", "www", "mail"]
+
+
+def test_populate_handles_missing_domain(monkeypatch, provider_factory):
     class MissingClient(FakeClient):
         def list_zone_records(self, domain):
             raise MetanameError("Domain name not found")
 
     client = MissingClient()
-    provider = MetanameProvider(
-        "metaname",
-        client=client,
-        record_factory=fake_record_factory,
-        sleep=lambda _: None,
-    )
+    provider = provider_factory(client)
 
     zone = DummyZone("missing.nz.")
     added = provider.populate(zone)
@@ -172,144 +215,371 @@ def test_populate_handles_missing_domain(monkeypatch):
     assert zone.records == []
 
 
-def test_populate_skips_blank_records(caplog):
-    zone_record = ZoneRecord(
-        reference="rec-empty",
-        name="@",
-        rtype="A",
-        data="",
-        ttl=3600,
-    )
-    client = FakeClient(records=[zone_record])
-    provider = MetanameProvider(
-        "metaname",
-        client=client,
-        record_factory=fake_record_factory,
-        sleep=lambda _: None,
-    )
+def test_populate_skips_blank_records(caplog, provider_factory):
+    client = FakeClient(records=[BLANK_A])
+    provider = provider_factory(client)
 
-    caplog.set_level("WARNING")
     zone = DummyZone("opstest.nz.")
-    added = provider.populate(zone)
+    with caplog.at_level(logging.WARNING, logger=provider.log.name):
+        added = provider.populate(zone)
 
     assert added is False
     assert zone.records == []
-    assert client.actions == [("list", "opstest.nz")]
-    assert any("empty value" in message for message in caplog.messages)
+    assert tuple(client.actions) == _EXPECTED_LIST
+    assert any(
+        record.levelno >= logging.WARNING and "empty value" in record.getMessage()
+        for record in caplog.records
+    )
 
 
-def test_apply_create_makes_api_calls():
-    client = FakeClient()
-    provider = MetanameProvider(
-        "metaname",
-        client=client,
-        record_factory=fake_record_factory,
-        sleep=lambda _: None,
-    )
-    record = FakeRecord(
-        name="@",
-        rtype="MX",
-        ttl=3600,
-        values=[{"exchange": "mx1.forwardemail.net.", "preference": 10}],
-    )
-    plan = DummyPlan([Create(record)], "opstest.nz.")
+def test_populate_reuses_listing_within_cache_ttl(provider_factory):
+    client = FakeClient(records=[WWW_A])
+    now = [100.0]
+    provider = provider_factory(client, cache_ttl=60, clock=lambda: now[0])
 
-    provider.apply(plan)
+    provider.populate(DummyZone("opstest.nz."))
+    now[0] += 30
+    provider.populate(DummyZone("opstest.nz."))
+    assert tuple(client.actions) == _EXPECTED_LIST
+
+    now[0] += 31
+    provider.populate(DummyZone("opstest.nz."))
+    assert tuple(client.actions) == _EXPECTED_LIST * 2
+
+    record = FakeRecord(name="www", rtype="A", ttl=300, values=["2.2.2.2"])
+    provider.apply(DummyPlan([Create(record)], "opstest.nz."))
+    provider.populate(DummyZone("opstest.nz."))
+    assert [action[0] for action in client.actions] == ["list", "list", "create", "list"]
 
-    assert client.actions[0][0] == "create"
-    _, domain, payload = client.actions[0]
+
+def test_apply_create_makes_api_calls(provider_factory):
+    client = FakeClient()
+    provider = provider_factory(client)
+    provider.apply(MX_PLAN)
+
+    assert client.actions[0] == ("list", "opstest.nz")
+    assert client.actions[1][0] == "create"
+    _, domain, payload = client.actions[1]
     assert domain == "opstest.nz"
-    assert payload.rtype == "MX"
-    assert payload.data == "mx1.forwardemail.net."
-    assert payload.aux == 10
-
-
-def test_apply_delete_uses_cached_reference():
-    zone_record = ZoneRecord(
-        reference="rec-1",
-        name="@",
-        rtype="TXT",
-        data="hello",
-        ttl=3600,
-    )
+    assert payload["type"] == "MX"
+    assert payload["data"] == "mx1.forwardemail.net."
+    assert payload["aux"] == 10
+
+
+def test_apply_strips_octodns_value_subclasses(provider_factory):
+    class TargetValue(str):
+        """Stand-in for OctoDNS' ``str``-subclass value types."""
+
     client = FakeClient()
-    provider = MetanameProvider(
-        "metaname",
-        client=client,
-        record_factory=fake_record_factory,
-        sleep=lambda _: None,
-    )
-    provider._zone_cache["opstest.nz"] = {provider._cache_key(zone_record): zone_record}
+    provider = provider_factory(client)
+    record = FakeRecord(name="www", rtype="CNAME", ttl=300, values=[], value=TargetValue(" a.nz "))
 
-    record = FakeRecord(name="@", rtype="TXT", ttl=3600, values=["hello"])
-    plan = DummyPlan([Delete(record)], "opstest.nz.")
+    provider.apply(DummyPlan([Create(record)], "opstest.nz."))
 
-    provider.apply(plan)
+    assert client.actions[-1][2]["data"] == "a.nz."
 
-    assert client.actions == [("delete", "opstest.nz", "rec-1")]
 
+def test_apply_sends_deletes_and_creates_as_separate_batches(provider_factory):
+    batches = []
 
-def test_apply_delete_populates_cache_when_missing():
-    zone_record = ZoneRecord(
-        reference="rec-2",
-        name="_dmarc",
-        rtype="TXT",
-        data="v=DMARC1",
-        ttl=3600,
-    )
-    client = FakeClient(records=[zone_record])
-    provider = MetanameProvider(
-        "metaname",
-        client=client,
-        record_factory=fake_record_factory,
-        sleep=lambda _: None,
-    )
+    class BatchClient(FakeClient):
+        def _rpc_batch(self, calls):
+            batches.append([method for method, _ in calls])
+            return super()._rpc_batch(calls)
 
-    record = FakeRecord(name="_dmarc", rtype="TXT", ttl=3600, values=["v=DMARC1"])
-    plan = DummyPlan([Delete(record)], "opstest.nz.")
+    client = BatchClient(records=[TXT_OLD])
+    provider = provider_factory(client)
+    existing = FakeRecord(name="@", rtype="TXT", ttl=3600, values=["old"])
+    new = FakeRecord(name="@", rtype="TXT", ttl=3600, values=["new-1", "new-2"])
+    plan = DummyPlan([Update(existing, new)], "opstest.nz.")
 
     provider.apply(plan)
 
-    assert client.actions == [
-        ("list", "opstest.nz"),
-        ("delete", "opstest.nz", "rec-2"),
+    assert batches == [
+        ["delete_dns_record"],
+        ["create_dns_record", "create_dns_record"],
     ]
 
 
-def test_retry_wrapper_retries_then_succeeds():
+def test_apply_does_not_resend_batch_with_entry_errors(provider_factory):
+    class PartialClient(FakeClient):
+        def _rpc_batch(self, calls):
+            results = super()._rpc_batch(calls)
+            results[-1] = MetanameAPIError("temporary failure", code=1)
+            return results
+
+    client = PartialClient(records=[TXT_OLD])
+    provider = provider_factory(client)
+    existing = FakeRecord(name="@", rtype="TXT", ttl=3600, values=["old"])
+    new = FakeRecord(name="@", rtype="TXT", ttl=3600, values=["a", "b", "c"])
+
+    with pytest.raises(MetanameAPIError, match="temporary failure"):
+        provider.apply(DummyPlan([Update(existing, new)], "opstest.nz."))
+
+    # The failed delete phase is sent once and the creates never go out.
+    assert [action[0] for action in client.actions] == ["list", "delete"]
+
+
+def test_apply_retries_batch_without_response(provider_factory):
+    attempts = [0]
+
+    class FlakyClient(FakeClient):
+        def _rpc_batch(self, calls):
+            attempts[0] += 1
+            if attempts[0] == 1:
+                raise MetanameConnectionError("connection refused")
+            return super()._rpc_batch(calls)
+
+    client = FlakyClient()
+    provider = provider_factory(client)
+
+    provider.apply(MX_PLAN)
+
+    assert attempts[0] == 2
+    assert [action[0] for action in client.actions] == ["list", "create"]
+
+
+def test_apply_falls_back_when_batches_are_rejected(provider_factory):
+    class NoBatchClient(FakeClient):
+        def _rpc_batch(self, calls):
+            raise MetanameAPIError("Invalid Request", code=-32600)
+
+    client = NoBatchClient()
+    provider = provider_factory(client)
+
+    provider.apply(MX_PLAN)
+
+    assert provider.batch is False
+    assert [action[0] for action in client.actions] == ["list", "create"]
+
+
+def test_apply_dispatches_registered_change_types(monkeypatch, provider_factory):
+    class OctoCreate(Create):
+        """Change type whose name does not match the fallback lookup."""
+
+    class Rename(Create):
+        """Change type the provider does not know how to handle."""
+
+    monkeypatch.setitem(octodns_metaname._CHANGE_ACTIONS, OctoCreate, "create")
     client = FakeClient()
-    provider = MetanameProvider(
-        "metaname",
-        client=client,
-        retries=3,
-        retry_backoff=0,
-        sleep=lambda _: None,
-    )
+    provider = provider_factory(client)
+    record = FakeRecord(name="www", rtype="A", ttl=300, values=["1.2.3.4"])
 
-    attempts = {"count": 0}
+    provider.apply(DummyPlan([OctoCreate(record)], "opstest.nz."))
 
-    def flaky(*_args, **_kwargs):
-        attempts["count"] += 1
-        if attempts["count"] < 3:
-            raise MetanameError("temporary failure")
+    assert [action[0] for action in client.actions] == ["list", "create"]
+    with pytest.raises(ValueError, match="Unsupported change action: rename"):
+        provider.apply(DummyPlan([Rename(record)], "opstest.nz."))
+
+
+def test_apply_skips_creates_already_present(provider_factory):
+    client = FakeClient()
+    provider = provider_factory(client)
+    provider._zone_cache["opstest.nz"] = {TXT_A_KEY: TXT_A}
+    record = FakeRecord(name="@", rtype="TXT", ttl=3600, values=["a", "b", "b"])
+
+    provider.apply(DummyPlan([Create(record)], "opstest.nz."))
+
+    assert [(action[0], action[2]["data"]) for action in client.actions] == [("create", "b")]
+
+
+def test_apply_ttl_only_update_recreates_record(provider_factory):
+    client = FakeClient()
+    provider = provider_factory(client)
+    provider._zone_cache["opstest.nz"] = {TXT_A_KEY: TXT_A}
+    existing = FakeRecord(name="@", rtype="TXT", ttl=3600, values=["a"])
+    new = FakeRecord(name="@", rtype="TXT", ttl=300, values=["a"])
+
+    provider.apply(DummyPlan([Update(existing, new)], "opstest.nz."))
+
+    assert [action[0] for action in client.actions] == ["delete", "create"]
+    assert client.actions[1][2]["ttl"] == 300
+
+
+def test_apply_delete_uses_cached_reference(provider_factory):
+    client = FakeClient()
+    provider = provider_factory(client)
+    provider._zone_cache["opstest.nz"] = {TXT_HELLO_KEY: TXT_HELLO}
+
+    provider.apply(HELLO_DELETE_PLAN)
+
+    assert tuple(client.actions) == _EXPECTED_DELETE
+
+
+def test_apply_delete_populates_cache_when_missing(provider_factory):
+    client = FakeClient(records=[DMARC])
+    provider = provider_factory(client)
+
+    provider.apply(DMARC_DELETE_PLAN)
+
+    assert tuple(client.actions) == _EXPECTED_LIST_DELETE
+
+
+def test_apply_without_batch_sends_deletes_before_creates(provider_factory):
+    zone_records = [
+        ZoneRecord(reference=f"rec-{i}", name="@", rtype="TXT", data=f"old-{i}", ttl=3600)
+        for i in range(3)
+    ]
+
+    class NoBatchClient(FakeClient):
+        def _rpc_batch(self, calls):
+            raise AssertionError("batch RPC should not be used")
+
+    client = NoBatchClient(records=zone_records)
+    provider = provider_factory(client, batch=False, max_workers=4)
+    provider.populate(DummyZone("opstest.nz."))
+    existing = FakeRecord(name="@", rtype="TXT", ttl=3600, values=["old-0", "old-1", "old-2"])
+    new = FakeRecord(name="@", rtype="TXT", ttl=3600, values=["new-a", "new-b", "new-c"])
+
+    provider.apply(DummyPlan([Update(existing, new)], "opstest.nz."))
+
+    kinds = [action[0] for action in client.actions[1:]]
+    assert kinds == ["delete"] * 3 + ["create"] * 3
+    assert {action[2] for action in client.actions[1:4]} == {"rec-0", "rec-1", "rec-2"}
+    cached = provider._zone_cache["opstest.nz"]
+    assert sorted(record.data for record in cached.values()) == ["new-a", "new-b", "new-c"]
+
+
+def test_apply_updates_zone_cache_in_place(provider_factory):
+    client = FakeClient(records=[TXT_OLD])
+    provider = provider_factory(client)
+    existing = FakeRecord(name="@", rtype="TXT", ttl=3600, values=["old"])
+    new = FakeRecord(name="@", rtype="TXT", ttl=3600, values=["new"])
+
+    provider.apply(DummyPlan([Update(existing, new)], "opstest.nz."))
+    provider.apply(DummyPlan([Delete(new)], "opstest.nz."))
+
+    assert [action[0] for action in client.actions] == ["list", "delete", "create", "delete"]
+    assert client.actions[-1] == ("delete", "opstest.nz", "new-3")
+    assert provider._zone_cache["opstest.nz"] == {}
+
+
+def test_apply_failure_drops_zone_cache(provider_factory):
+    landed = ZoneRecord(reference="rec-9", name="@", rtype="TXT", data="gone", ttl=3600)
+
+    class TimeoutClient(FakeClient):
+        timeout = True
+
+        def _rpc_batch(self, calls):
+            results = super()._rpc_batch(calls)
+            if not self.timeout:
+                return results
+            # The server applied the batch but the reply never arrived.
+            self.records = (landed,)
+            raise MetanameTransportError("read timed out")
+
+    client = TimeoutClient()
+    provider = provider_factory(client)
+    record = FakeRecord(name="@", rtype="TXT", ttl=3600, values=["gone"])
+
+    with pytest.raises(MetanameTransportError):
+        provider.apply(DummyPlan([Create(record)], "opstest.nz."))
+    # The reply may follow an applied batch, so it is not re-sent.
+    assert [action[0] for action in client.actions] == ["list", "create"]
+    assert "opstest.nz" not in provider._zone_cache
+
+    client.timeout = False
+    provider.apply(DummyPlan([Delete(record)], "opstest.nz."))
+
+    assert client.actions[-2:] == [("list", "opstest.nz"), ("delete", "opstest.nz", "rec-9")]
+
+
+def test_apply_create_without_reference_drops_zone_cache(provider_factory):
+    landed = ZoneRecord(reference="rec-7", name="@", rtype="TXT", data="x", ttl=3600)
+
+    class NoReferenceClient(FakeClient):
+        def _rpc(self, method, params):
+            result = super()._rpc(method, params)
+            if method == "create_dns_record":
+                self.records = (landed,)
+                return {}
+            return result
+
+    client = NoReferenceClient()
+    provider = provider_factory(client)
+    record = FakeRecord(name="@", rtype="TXT", ttl=3600, values=["x"])
+
+    provider.apply(DummyPlan([Create(record)], "opstest.nz."))
+    assert "opstest.nz" not in provider._zone_cache
+
+    provider.apply(DummyPlan([Delete(record)], "opstest.nz."))
+
+    assert client.actions[-2:] == [("list", "opstest.nz"), ("delete", "opstest.nz", "rec-7")]
+
+
+@pytest.mark.parametrize(
+    "failures,expected",
+    [
+        pytest.param(2, "ok", id="retries-then-succeeds"),
+        pytest.param(3, MetanameError, id="raises-last-error"),
+    ],
+)
+def test_retry_wrapper(failures, expected, provider_factory):
+    provider = provider_factory(FakeClient(), retries=3, retry_backoff=0)
+    attempts = [0]
+
+    def flaky():
+        attempts[0] += 1
+        if attempts[0] <= failures:
+            raise MetanameError(f"failure {attempts[0]}")
         return "ok"
 
-    result = provider._with_retries(flaky)
-    assert result == "ok"
-    assert attempts["count"] == 3
+    if isinstance(expected, type):
+        with pytest.raises(expected, match="failure 3"):
+            provider._with_retries(flaky)
+    else:
+        assert provider._with_retries(flaky) == expected
+    assert attempts[0] == 3
 
 
-def test_retry_wrapper_raises_last_error():
-    provider = MetanameProvider(
-        "metaname",
-        client=FakeClient(),
-        retries=2,
-        retry_backoff=0,
-        sleep=lambda _: None,
-    )
+def test_retry_wrapper_backs_off_exponentially_with_jitter(provider_factory):
+    delays = []
+    provider = provider_factory(FakeClient(), retries=4, retry_backoff=1.0, sleep=delays.append)
 
     def always_fail():
         raise MetanameError("fail")
 
     with pytest.raises(MetanameError):
         provider._with_retries(always_fail)
+
+    assert len(delays) == 3
+    for attempt, delay in enumerate(delays):
+        assert 0.5 * 2**attempt <= delay < 1.5 * 2**attempt
+
+
+@pytest.mark.parametrize(
+    "error",
+    [
+        MetanameAPIError("Domain name not found", code=1),
+        MetanameAPIError("Method not found", code=-32601),
+        MetanameAPIError("Authentication failed: invalid API key", code=3),
+    ],
+)
+def test_retry_wrapper_does_not_retry_permanent_errors(error, provider_factory):
+    delays = []
+    provider = provider_factory(FakeClient(), retries=3, sleep=delays.append)
+    attempts = {"count": 0}
+
+    def fail():
+        attempts["count"] += 1
+        raise error
+
+    with pytest.raises(MetanameAPIError):
+        provider._with_retries(fail)
+
+    assert attempts["count"] == 1
+    assert delays == []
+
+
+def test_default_client_pool_matches_max_workers(monkeypatch):
+    built = []
+
+    def fake_client(**kwargs):
+        built.append(kwargs)
+        return FakeClient()
+
+    monkeypatch.setattr(octodns_metaname, "MetanameClient", fake_client)
+
+    MetanameProvider("metaname", max_workers=32)
+
+    assert built == [{"base_url": octodns_metaname.TEST_API_URL, "pool_maxsize": 32}]
@@ -1,24 +1,18 @@
 """Unit tests for the secret resolution utilities."""
 
-import os
-
 import pytest
 
 from octodns_metaname import secrets
 
 
 def teardown_function():
-    """Reset resolver state and env vars between tests."""
+    """Reset resolver state between tests; ``monkeypatch`` undoes the env vars."""
 
     secrets.clear_secret_resolver()
-    for key in list(os.environ):
-        if key.startswith("TEST_SECRET"):
-            os.environ.pop(key, None)
-    os.environ.pop("OCTODNS_METANAME_SECRET_RESOLVER", None)
 
 
-def test_get_secret_direct_env():
-    os.environ["TEST_SECRET"] = "value"
+def test_get_secret_direct_env(monkeypatch):
+    monkeypatch.setenv("TEST_SECRET", "value")
     assert secrets.get_secret("TEST_SECRET") == "value"
 
 
@@ -27,14 +21,14 @@ def test_get_secret_missing_raises():
         secrets.get_secret("TEST_SECRET")
 
 
-def test_get_secret_reference_without_resolver():
-    os.environ["TEST_SECRET_REF"] = "ref-value"
+def test_get_secret_reference_without_resolver(monkeypatch):
+    monkeypatch.setenv("TEST_SECRET_REF", "ref-value")
     with pytest.raises(secrets.MissingSecret):
         secrets.get_secret("TEST_SECRET")
 
 
-def test_get_secret_with_registered_resolver():
-    os.environ["TEST_SECRET_REF"] = "ref-value"
+def test_get_secret_with_registered_resolver(monkeypatch):
+    monkeypatch.setenv("TEST_SECRET_REF", "ref-value")
 
     def resolver(name: str, reference: str | None):
         if reference == "ref-value":
@@ -45,7 +39,26 @@ def test_get_secret_with_registered_resolver():
     assert secrets.get_secret("TEST_SECRET") == "resolved"
 
 
-def test_get_secret_with_env_loader():
-    os.environ["TEST_SECRET_REF"] = "ref-env"
-    os.environ["OCTODNS_METANAME_SECRET_RESOLVER"] = "octodns_metaname.testing_resolver:resolver"
+def test_get_secret_caches_resolver_results(monkeypatch):
+    monkeypatch.setenv("TEST_SECRET_REF", "ref-value")
+    calls = []
+
+    def resolver(name: str, reference: str | None):
+        calls.append((name, reference))
+        return "resolved"
+
+    secrets.set_secret_resolver(resolver)
+    assert secrets.get_secret("TEST_SECRET") == "resolved"
+    assert secrets.get_secret("TEST_SECRET") == "resolved"
+    assert calls == [("TEST_SECRET", "ref-value")]
+
+    monkeypatch.setenv("TEST_SECRET", "direct")
+    assert secrets.get_secret("TEST_SECRET") == "direct"
+
+
+def test_get_secret_with_env_loader(monkeypatch):
+    monkeypatch.setenv("TEST_SECRET_REF", "ref-env")
+    monkeypatch.setenv(
+        "OCTODNS_METANAME_SECRET_RESOLVER", "octodns_metaname.testing_resolver:resolver"
+    )
     assert secrets.get_secret("TEST_SECRET") == "resolved-from-env"